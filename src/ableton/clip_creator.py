@@ -14,8 +14,8 @@ class ClipCreator:
     def ensure_midi_track(self, track_index: int, name: str = None) -> None:
         """Ensure a MIDI track exists at the given index."""
         try:
-            # Create a new MIDI track
-            self.controller.create_midi_track()
+            # Create a new MIDI track where it will be named
+            self.controller.create_midi_track(track_index)
             
             # Set track name if provided
             if name:
@@ -0,0 +1,158 @@
+import math
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+from .controller import AbletonController
+from .clip_creator import ClipCreator
+from src.utils.helpers import normalize_value
+from src.utils.music_theory import MusicTheory
+
+logger = logging.getLogger(__name__)
+
+# An execution plan is the ordered list of OSC (address, args) pairs for a command
+Plan = List[Tuple[str, Tuple[Any, ...]]]
+
+# Track and clip indices must be whole, non-negative numbers
+INDEX = {'type': int, 'min': 0}
+
+# Longest bassline, in bars, that a single command may generate
+MAX_BASSLINE_BARS = 64
+
+class CommandRegistry:
+    """Compile parsed commands into validated OSC execution plans and cache them."""
+    
+    # Parameters accepted by each command. Values with a 'range' are clamped to it,
+    # values below 'min' or outside 'choices' are rejected, as are NaN, infinity and bools.
+    COMMANDS = {
+        'set_tempo': {'bpm': {'type': float, 'range': (20.0, 999.0)}},  # Ableton's tempo range
+        'start_playback': {},
+        'stop_playback': {},
+        'trigger_clip': {'track': INDEX, 'clip': INDEX},
+        'stop_clip': {'track': INDEX, 'clip': INDEX},
+        'set_track_volume': {'track': INDEX, 'volume': {'type': float, 'range': (0.0, 1.0)}},
+        'set_track_pan': {'track': INDEX, 'pan': {'type': float, 'range': (-1.0, 1.0)}},
+        'mute_track': {'track': INDEX},
+        'unmute_track': {'track': INDEX},
+        'solo_track': {'track': INDEX},
+        'unsolo_track': {'track': INDEX},
+        'create_bassline': {
+            'root': {'type': str, 'default': 'C', 'case': str.upper, 'choices': MusicTheory.NOTES},
+            'scale_type': {'type': str, 'default': 'minor', 'case': str.lower,
+                           'choices': MusicTheory.SCALE_PATTERNS},
+            'pattern': {'type': str, 'default': 'walking', 'case': str.lower,
+                        'choices': MusicTheory.BASS_PATTERNS},
+            'length': {'type': int, 'default': 4, 'range': (1, MAX_BASSLINE_BARS)}
+        }
+    }
+    
+    def __init__(self, controller: AbletonController, clip_creator: ClipCreator, maxsize: int = 128):
+        """Initialize the registry with an LRU plan cache holding up to maxsize commands."""
+        self.controller = controller
+        self.clip_creator = clip_creator
+        self.maxsize = maxsize
+        self._plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    async def get_plan(self, command: str, processor) -> Plan:
+        """Return the execution plan for a command, parsing and compiling it on a cache miss.
+        
+        Identical commands reuse the cached plan, so a generated bassline is replayed
+        rather than generated again.
+        """
+        key = ' '.join(command.lower().split())
+        if key in self._plans:
+            self.hits += 1
+            self._plans.move_to_end(key)
+            return self._plans[key]
+        
+        self.misses += 1
+        actions = await processor.process_commands(command)
+        plan = []
+        for function_name, params in actions:
+            plan.extend(self.compile(function_name, params))
+        
+        self._plans[key] = plan
+        if len(self._plans) > self.maxsize:
+            self._plans.popitem(last=False)
+        return plan
+    
+    def compile(self, function_name: str, params: Dict[str, Any]) -> Plan:
+        """Compile a single parsed action into its OSC execution plan."""
+        params = self.validate(function_name, params)
+        
+        with self.controller.record() as plan:
+            if function_name == 'create_bassline':
+                # Generate bassline notes using music theory
+                notes = MusicTheory.generate_bassline(**params)
+                track_name = f"{params['root']} {params['scale_type'].title()} Bass"
+                self.clip_creator.create_bassline(0, 0, notes, track_name=track_name)
+            else:
+                getattr(self.controller, function_name)(**params)
+        return plan
+    
+    def validate(self, function_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Check an action's parameters and coerce them to the types the controller expects."""
+        if function_name not in self.COMMANDS:
+            raise ValueError(f"Unknown command: {function_name}")
+        specs = self.COMMANDS[function_name]
+        
+        unexpected = set(params) - set(specs)
+        if unexpected:
+            raise ValueError(f"Unexpected parameters for {function_name}: {', '.join(sorted(unexpected))}")
+        
+        validated = {}
+        for name, spec in specs.items():
+            if name in params:
+                validated[name] = self._coerce(function_name, name, params[name], spec)
+            elif 'default' in spec:
+                validated[name] = spec['default']
+            else:
+                raise ValueError(f"Missing parameter for {function_name}: {name}")
+        return validated
+    
+    def _coerce(self, function_name: str, name: str, value: Any, spec: Dict[str, Any]) -> Any:
+        """Coerce one parameter value according to its spec."""
+        # bool is an int subclass, so True would otherwise pass as track 1
+        if isinstance(value, bool):
+            raise ValueError(f"Invalid {name} for {function_name}: {value!r}")
+        
+        try:
+            if spec['type'] is int:
+                number = float(value)
+                if not number.is_integer():
+                    raise ValueError
+                value = int(number)
+            else:
+                value = spec['type'](value)
+            if spec['type'] is float and not math.isfinite(value):
+                raise ValueError
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"Invalid {name} for {function_name}: {value!r}")
+        
+        if 'case' in spec:
+            value = spec['case'](value)
+        if 'choices' in spec and value not in spec['choices']:
+            raise ValueError(f"Invalid {name} for {function_name}: {value!r}")
+        if 'min' in spec and value < spec['min']:
+            raise ValueError(f"Invalid {name} for {function_name}: {value!r}")
+        if 'range' in spec:
+            value = normalize_value(value, *spec['range'])
+        return value
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return plan cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._plans),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+    
+    def clear(self) -> None:
+        """Drop all cached plans and reset the statistics."""
+        self._plans.clear()
+        self.hits = 0
+        self.misses = 0
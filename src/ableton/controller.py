@@ -1,16 +1,61 @@
 import logging
 import socket
+from contextlib import contextmanager
+from typing import Any, List, Tuple
 from pythonosc import udp_client
 from pythonosc import osc_message_builder
+from pythonosc import osc_bundle_builder
 
 logger = logging.getLogger(__name__)
 
+# Largest datagram to send; stays below the default UDP send buffer limits (e.g. 9216 on macOS)
+MAX_DATAGRAM_SIZE = 8192
+
+def build_packet(commands: List[Tuple[str, Tuple[Any, ...]]]):
+    """Build one OSC packet for the commands: a plain message if there is only one, else a bundle."""
+    return _pack([_build_message(address, args) for address, args in commands])
+
+def build_packets(commands: List[Tuple[str, Tuple[Any, ...]]], max_size: int = MAX_DATAGRAM_SIZE) -> list:
+    """Build OSC packets for the commands in order, starting a new bundle whenever one would exceed max_size."""
+    packets = []
+    chunk = []
+    size = 16  # Bundle header: "#bundle" and the time tag
+    for address, args in commands:
+        message = _build_message(address, args)
+        message_size = 4 + message.size  # Each bundle element is prefixed with its length
+        if chunk and size + message_size > max_size:
+            packets.append(_pack(chunk))
+            chunk = []
+            size = 16
+        chunk.append(message)
+        size += message_size
+    if chunk:
+        packets.append(_pack(chunk))
+    return packets
+
+def _build_message(address: str, args: Tuple[Any, ...]):
+    """Build a single OSC message."""
+    message = osc_message_builder.OscMessageBuilder(address=address)
+    for arg in args:
+        message.add_arg(arg)
+    return message.build()
+
+def _pack(messages: list):
+    """Wrap messages in a bundle, unless there is only one."""
+    if len(messages) == 1:
+        return messages[0]
+    bundle = osc_bundle_builder.OscBundleBuilder(osc_bundle_builder.IMMEDIATELY)
+    for message in messages:
+        bundle.add_content(message)
+    return bundle.build()
+
 class AbletonController:
     """Control Ableton Live via OSC."""
     
-    def __init__(self, host="127.0.0.1", port=11000):
-        """Initialize the controller."""
-        self.client = udp_client.SimpleUDPClient(host, port)
+    def __init__(self, host="127.0.0.1", port=11000, client=None):
+        """Initialize the controller, optionally on an existing OSC client."""
+        self.client = client or udp_client.SimpleUDPClient(host, port)
+        self._pending = None  # Commands collected by an open record()
         logger.info(f"Initialized Ableton controller on {host}:{port}")
         # Send test message to verify connection
         self.test_connection()
@@ -26,16 +71,41 @@ class AbletonController:
     
     def send_command(self, address, *args):
         """Send an OSC command to Ableton Live."""
+        if self._pending is not None:
+            self._pending.append((address, args))
+            return
+        logger.debug(f"Sent command: {address} {args}")
+        self.send_bundle([(address, args)])
+    
+    def send_bundle(self, commands: List[Tuple[str, Tuple[Any, ...]]]):
+        """Send several OSC commands to Ableton Live as bundles, split so each fits in one datagram."""
+        if not commands:
+            return
+        
         try:
-            logger.debug(f"Sent command: {address} {args}")
-            self.client.send_message(address, args if args else None)
+            for packet in build_packets(commands):
+                self.client.send(packet)
+            if len(commands) > 1:
+                logger.debug(f"Sent bundle of {len(commands)} commands")
         except Exception as e:
             logger.error(f"Error sending command: {e}")
             raise
     
-    def create_midi_track(self):
-        """Create a new MIDI track."""
-        self.send_command("/live/song/create_midi_track", -1)  # -1 = end of list
+    @contextmanager
+    def record(self):
+        """Capture the commands sent inside the block instead of sending them.
+        
+        Yields the list the (address, args) pairs are appended to.
+        """
+        outer, self._pending = self._pending, []
+        try:
+            yield self._pending
+        finally:
+            self._pending = outer
+    
+    def create_midi_track(self, index: int = -1):
+        """Create a new MIDI track at the given index."""
+        self.send_command("/live/song/create_midi_track", index)  # -1 = end of list
     
     def set_track_name(self, track_index: int, name: str):
         """Set track name."""
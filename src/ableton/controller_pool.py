@@ -0,0 +1,225 @@
+import os
+import time
+import socket
+import logging
+from collections import deque
+from typing import Any, Dict, List, Tuple
+from pythonosc import udp_client
+from .controller import AbletonController, build_packet, build_packets
+
+logger = logging.getLogger(__name__)
+
+# Commands addressed to a single track; their first argument is the track index
+SHARDED_PREFIXES = ('/live/track/', '/live/clip/', '/live/clip_slot/', '/live/song/create_midi_track')
+
+class OSCEndpoint:
+    """One Live instance in a pool, with its own socket and send statistics.
+    
+    errors and last_error only describe local send failures; UDP cannot tell whether
+    Live received anything. healthy is set by ControllerPool.check_health from the
+    instance's replies and stays None until it has been checked.
+    """
+    
+    def __init__(self, host: str, port: int, window: float = 10.0):
+        """Initialize the endpoint; the send rate is measured over the last window seconds."""
+        self.host = host
+        self.port = port
+        self.address = (socket.gethostbyname(host), port)  # Where replies come from
+        self.client = udp_client.SimpleUDPClient(host, port)
+        self.window = window
+        self.sent = 0
+        self.errors = 0
+        self.last_error = None
+        self.healthy = None
+        self.last_seen = None  # time.monotonic() of the last reply
+        self._recent = deque()  # (timestamp, message count) of recent sends
+    
+    def send(self, commands: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+        """Send the commands to this instance, split into packets that each fit in one datagram."""
+        try:
+            for packet in build_packets(commands):
+                self.client.send(packet)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            raise
+        
+        self.sent += len(commands)
+        now = time.monotonic()
+        self._recent.append((now, len(commands)))
+        self._prune(now)
+    
+    def send_rate(self) -> float:
+        """Return the messages per second sent over the last window."""
+        self._prune(time.monotonic())
+        return sum(count for _, count in self._recent) / self.window
+    
+    def _prune(self, now: float) -> None:
+        """Forget sends older than the window."""
+        while self._recent and self._recent[0][0] < now - self.window:
+            self._recent.popleft()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return send and health statistics."""
+        return {
+            'endpoint': f"{self.host}:{self.port}",
+            'sent': self.sent,
+            'rate': self.send_rate(),
+            'errors': self.errors,
+            'last_error': self.last_error,
+            'healthy': self.healthy,
+            'last_seen': time.monotonic() - self.last_seen if self.last_seen is not None else None
+        }
+
+class ControllerPool(AbletonController):
+    """Control several Ableton Live instances as one controller.
+    
+    Track, clip and track creation commands are sharded by track index: track n goes
+    to instance n % size as its local track n // size. All other commands (transport,
+    tempo) are broadcast to every instance.
+    
+    With a return port, check_health() probes each instance with /live/test and marks
+    the ones that do not reply in time as unhealthy.
+    """
+    
+    def __init__(self, endpoints: List[Tuple[str, int]], window: float = 10.0, return_port: int = None):
+        """Initialize the pool with one socket per distinct (host, port)."""
+        unique = list(dict.fromkeys((host, int(port)) for host, port in endpoints))
+        if not unique:
+            raise ValueError("Controller pool needs at least one endpoint")
+        
+        self.endpoints = [OSCEndpoint(host, port, window) for host, port in unique]
+        self.return_socket = None
+        if return_port is not None:
+            try:
+                self.return_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self.return_socket.bind(('0.0.0.0', return_port))
+            except OSError as e:
+                logger.warning(f"Could not listen on return port {return_port}, health checks disabled: {e}")
+                self.return_socket.close()
+                self.return_socket = None
+        logger.info(f"Initialized Ableton controller pool on {', '.join(f'{h}:{p}' for h, p in unique)}")
+        # The first instance's socket doubles as the base controller's client
+        super().__init__(*unique[0], client=self.endpoints[0].client)
+    
+    @classmethod
+    def from_env(cls) -> 'ControllerPool':
+        """Create a pool from ABLETON_OSC_INSTANCES, or ABLETON_OSC_HOST/PORT for a single instance.
+        
+        ABLETON_OSC_INSTANCES is a comma-separated list of host:port pairs. Replies to
+        health checks are received on ABLETON_OSC_RETURN_PORT.
+        """
+        instances = os.getenv('ABLETON_OSC_INSTANCES', '').strip()
+        if instances:
+            endpoints = []
+            for instance in instances.split(','):
+                host, _, port = instance.strip().rpartition(':')
+                if not host or not port.isdigit():
+                    raise ValueError(f"Invalid Ableton instance '{instance.strip()}', expected host:port")
+                endpoints.append((host, int(port)))
+        else:
+            endpoints = [(os.getenv('ABLETON_OSC_HOST', '127.0.0.1'),
+                          int(os.getenv('ABLETON_OSC_PORT', '11000')))]
+        return_port = os.getenv('ABLETON_OSC_RETURN_PORT')
+        return cls(endpoints, return_port=int(return_port) if return_port else None)
+    
+    def send_bundle(self, commands: List[Tuple[str, Tuple[Any, ...]]]):
+        """Send several OSC commands, one bundle per instance involved.
+        
+        Broadcast commands are best effort: they only fail if no instance could be reached.
+        Sharded commands exist on a single instance, so failing to send them always raises.
+        """
+        routed = {}
+        owners = set()  # Instances holding sharded commands
+        for address, args in commands:
+            if self.is_sharded(address, args):
+                owners.add(self.shard(int(args[0]))[0])
+            for index, routed_args in self.route(address, args):
+                routed.setdefault(index, []).append((address, routed_args))
+        
+        # A failing instance must not stop the others from receiving their share
+        failures = {}
+        for index, endpoint_commands in routed.items():
+            endpoint = self.endpoints[index]
+            try:
+                endpoint.send(endpoint_commands)
+            except Exception as e:
+                logger.error(f"Error sending to {endpoint.host}:{endpoint.port}: {e}")
+                failures[index] = e
+        
+        if owners & set(failures) or (routed and len(failures) == len(routed)):
+            lost = ', '.join(f"{self.endpoints[i].host}:{self.endpoints[i].port} ({e})"
+                             for i, e in failures.items())
+            raise ConnectionError(f"Could not send commands to {lost}") from next(iter(failures.values()))
+    
+    def is_sharded(self, address: str, args: Tuple[Any, ...]) -> bool:
+        """Check whether a command belongs to a single track and so to a single instance."""
+        return address.startswith(SHARDED_PREFIXES) and bool(args)
+    
+    def route(self, address: str, args: Tuple[Any, ...]) -> List[Tuple[int, Tuple[Any, ...]]]:
+        """Return the (instance index, args) pairs a command is sent as."""
+        if self.is_sharded(address, args):
+            if int(args[0]) < 0:
+                # "End of list" has no owning instance
+                raise ValueError(f"{address} needs an explicit track index in a controller pool")
+            index, track = self.shard(int(args[0]))
+            return [(index, (track,) + tuple(args[1:]))]
+        return [(index, args) for index in range(len(self.endpoints))]
+    
+    def shard(self, track: int) -> Tuple[int, int]:
+        """Return the instance index a track is sharded to and its track index on that instance."""
+        return track % len(self.endpoints), track // len(self.endpoints)
+    
+    def check_health(self, timeout: float = 1.0) -> List[Dict[str, Any]]:
+        """Probe every instance with /live/test and wait up to timeout seconds for replies.
+        
+        The probes are sent from the return socket, so replies reach it whether Live
+        answers the sender's port or the return port.
+        """
+        if self.return_socket is None:
+            raise RuntimeError("Health checks need a return port")
+        
+        # Replies to an earlier check must not count for this one
+        self.return_socket.setblocking(False)
+        try:
+            while True:
+                self.return_socket.recvfrom(65536)
+        except OSError:
+            pass
+        
+        probe = build_packet([('/live/test', ())]).dgram
+        waiting = {}
+        for endpoint in self.endpoints:
+            try:
+                self.return_socket.sendto(probe, endpoint.address)
+                waiting[endpoint.address] = endpoint
+            except OSError as e:
+                endpoint.healthy = False
+                endpoint.last_error = str(e)
+        
+        deadline = time.monotonic() + timeout
+        while waiting:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.return_socket.settimeout(remaining)
+            try:
+                _, sender = self.return_socket.recvfrom(65536)
+            except socket.timeout:
+                break
+            except OSError:
+                # e.g. ICMP port unreachable from an instance that is down
+                continue
+            endpoint = waiting.pop(sender, None)
+            if endpoint is not None:
+                endpoint.healthy = True
+                endpoint.last_seen = time.monotonic()
+        
+        for endpoint in waiting.values():
+            endpoint.healthy = False
+            logger.warning(f"Ableton instance {endpoint.host}:{endpoint.port} did not answer within {timeout}s")
+        return self.stats()
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return send rate and health statistics for each instance."""
+        return [endpoint.stats() for endpoint in self.endpoints]
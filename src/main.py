@@ -10,9 +10,10 @@ from pathlib import Path
 load_dotenv()
 
 from ableton.controller import AbletonController
+from ableton.controller_pool import ControllerPool
 from ableton.clip_creator import ClipCreator
+from ableton.command_registry import CommandRegistry
 from nlp.processor import CommandProcessor
-from utils.music_theory import MusicTheory
 
 def setup_logging():
     """Configure logging based on environment settings."""
@@ -30,42 +31,38 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 async def process_musical_command(command: str, controller: AbletonController, 
-                                clip_creator: ClipCreator, processor: CommandProcessor) -> None:
-    """Process a musical command and create MIDI content."""
+                                clip_creator: ClipCreator, processor: CommandProcessor,
+                                registry: CommandRegistry = None) -> None:
+    """Process a musical command and create MIDI content.
+    
+    Compound commands ("tempo 124, mute track 2 and play") are parsed in one pass
+    and their actions dispatched to Ableton together. Pass a shared
+    registry to reuse the cached plans of commands seen before.
+    """
     # Force basic command processing
     processor.client = None
     
-    function_name, params = await processor.process_command(command)
+    if registry is None:
+        registry = CommandRegistry(controller, clip_creator)
     
-    if function_name == 'create_bassline':
-        # Generate bassline notes using music theory
-        notes = MusicTheory.generate_bassline(
-            root=params.get('root', 'C'),
-            scale_type=params.get('scale_type', 'minor'),
-            pattern=params.get('pattern', 'walking'),
-            length=params.get('length', 4)
-        )
-        
-        # Create the bassline in a new clip
-        clip_creator.create_bassline(0, 0, notes, track_name=f"{params.get('root')} {params.get('scale_type', 'minor').title()} Bass")
-    else:
-        # Handle other commands using the controller directly
-        if hasattr(controller, function_name):
-            method = getattr(controller, function_name)
-            method(**params)
-        else:
-            raise ValueError(f"Unknown command: {function_name}")
+    plan = await registry.get_plan(command, processor)
+    controller.send_bundle(plan)
 
 async def main():
     """Main entry point for the Ableton Control application."""
     logger = setup_logging()
     logger.info("Starting Ableton Control AI...")
+    controller = None
+    registry = None
     
     try:
         # Initialize components
-        controller = AbletonController()
+        controller = ControllerPool.from_env()
+        if controller.return_socket is not None:
+            controller.check_health()
         clip_creator = ClipCreator(controller)
         processor = CommandProcessor()
+        registry = CommandRegistry(controller, clip_creator)
         
         logger.info("Ready to process commands. Type 'exit' to quit.")
         while True:
@@ -74,7 +71,7 @@ async def main():
                 break
             
             try:
-                await process_musical_command(command, controller, clip_creator, processor)
+                await process_musical_command(command, controller, clip_creator, processor, registry)
                 logger.info(f"Successfully processed command: {command}")
             except Exception as e:
                 logger.error(f"Error processing command: {e}")
@@ -85,6 +82,11 @@ async def main():
     except Exception as e:
         logger.error(f"An error occurred: {e}", exc_info=True)
     finally:
+        if registry is not None:
+            logger.info(f"Command plan cache: {registry.stats()}")
+        if controller is not None:
+            for instance in controller.stats():
+                logger.info(f"Ableton instance: {instance}")
         logger.info("Ableton Control AI terminated.")
 
 if __name__ == "__main__":
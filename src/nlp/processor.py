@@ -1,13 +1,41 @@
 import os
 import logging
 import json
-from openai import OpenAI
+from openai import AsyncOpenAI
 import re
 from typing import Dict, Any, Optional, Tuple, List
 from src.utils.music_theory import MusicTheory
 
 logger = logging.getLogger(__name__)
 
+# Actions and vocabulary shared by the GPT system prompts
+ACTIONS_PROMPT = """
+        Available actions:
+        - set_tempo(bpm: float)
+        - start_playback()
+        - stop_playback()
+        - trigger_clip(track: int, clip: int)
+        - set_track_volume(track: int, volume: float)
+        - set_track_pan(track: int, pan: float)
+        - mute_track(track: int)
+        - solo_track(track: int)
+        - create_bassline(root: str, scale_type: str = 'minor', pattern: str = 'walking', length: int = 4)
+        
+        For musical commands, understand:
+        - Notes: C, C#, D, D#, E, F, F#, G, G#, A, A#, B
+        - Scales: major, minor, harmonic_minor, melodic_minor
+        - Patterns: simple, octave, walking, arpeggio
+        """
+
+# Possible separators between the clauses of a compound command, e.g. "tempo 124, mute track 2 and play".
+# The capturing group keeps the separators so fragments can be joined back together.
+# A comma or semicolon followed by "and", "then" or "and then" counts as a single separator.
+CLAUSE_SEPARATORS = re.compile(r'(\s*(?:[,;]\s*(?:(?:and\s+)?then\b|and\b)?|\band\s+then\b|\bthen\b|\band\b)\s*)',
+                               re.IGNORECASE)
+
+# Numeric values in a command, e.g. the track and volume in "volume track 2 0.5"
+NUMBERS = re.compile(r'-?(?:\d+\.?\d*|\.\d+)')
+
 class CommandProcessor:
     """Process natural language commands into Ableton control actions."""
     
@@ -15,7 +43,7 @@ class CommandProcessor:
         """Initialize the command processor."""
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         if self.openai_api_key:
-            self.client = OpenAI(api_key=self.openai_api_key)
+            self.client = AsyncOpenAI(api_key=self.openai_api_key)
         else:
             self.client = None
         
@@ -70,26 +98,22 @@ class CommandProcessor:
             logger.error(f"Error processing command: {e}")
             raise
     
+    async def process_commands(self, command: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Process a possibly compound command into an ordered list of actions."""
+        try:
+            if self.client:
+                return await self._process_compound_with_gpt(command)
+            else:
+                return self._process_compound_basic(command)
+        except Exception as e:
+            logger.error(f"Error processing command: {e}")
+            raise
+    
     async def _process_with_gpt(self, command: str) -> Tuple[str, Dict[str, Any]]:
         """Process command using GPT for more advanced understanding."""
         system_prompt = """
         You are an Ableton Live control system. Convert natural language commands into specific actions.
-        Available actions:
-        - set_tempo(bpm: float)
-        - start_playback()
-        - stop_playback()
-        - trigger_clip(track: int, clip: int)
-        - set_track_volume(track: int, volume: float)
-        - set_track_pan(track: int, pan: float)
-        - mute_track(track: int)
-        - solo_track(track: int)
-        - create_bassline(root: str, scale_type: str = 'minor', pattern: str = 'walking', length: int = 4)
-        
-        For musical commands, understand:
-        - Notes: C, C#, D, D#, E, F, F#, G, G#, A, A#, B
-        - Scales: major, minor, harmonic_minor, melodic_minor
-        - Patterns: simple, octave, walking, arpeggio
-        
+        """ + ACTIONS_PROMPT + """
         Respond with JSON containing 'function' and 'parameters'.
         Example: {"function": "create_bassline", "parameters": {"root": "G", "scale_type": "minor", "pattern": "walking", "length": 4}}
         """
@@ -109,6 +133,79 @@ class CommandProcessor:
             logger.error(f"Error parsing GPT response: {e}")
             return self._process_basic(command)
     
+    async def _process_compound_with_gpt(self, command: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Process a compound command using a single GPT call."""
+        system_prompt = """
+        You are an Ableton Live control system. Convert natural language commands into specific actions.
+        A command may ask for several actions at once.
+        """ + ACTIONS_PROMPT + """
+        Respond with JSON containing 'actions', a list of objects with 'function' and 'parameters',
+        in the order the actions should be performed.
+        Example: {"actions": [{"function": "set_tempo", "parameters": {"bpm": 124}}, {"function": "start_playback", "parameters": {}}]}
+        """
+        
+        response = await self.client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": command}
+            ]
+        )
+        
+        try:
+            result = json.loads(response.choices[0].message.content)
+            return [(action['function'], action['parameters']) for action in result['actions']]
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"Error parsing GPT response: {e}")
+            return self._process_compound_basic(command)
+    
+    def _process_compound_basic(self, command: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Split a compound command into clauses and process each one without GPT.
+        
+        A separator only starts a new clause if the text after it is a command of its own,
+        so "trigger clip 1, 2" or "with octave and walking" stay in one clause. A list of
+        values for a one-parameter command ("mute track 2, 3 and 4") repeats the command.
+        """
+        parts = CLAUSE_SEPARATORS.split(command)
+        clauses = [parts[0]]
+        for fragment in parts[2::2]:
+            if self._is_command(fragment):
+                clauses.append(fragment)
+            else:
+                clauses[-1] += ' ' + fragment
+        
+        clauses = [clause for clause in clauses if clause.strip()]
+        if not clauses:
+            raise ValueError(f"Could not understand command: {command}")
+        
+        actions = []
+        for clause in clauses:
+            action = self._match_action(clause)
+            values = NUMBERS.findall(clause)
+            if action and len(action['params']) == 1 and len(values) > 1:
+                actions.extend((action['function'], {action['params'][0]: float(value)}) for value in values)
+            else:
+                actions.append(self._process_basic(clause))
+        return actions
+    
+    def _match_action(self, command: str) -> Optional[Dict[str, Any]]:
+        """Return the command pattern action a (non-bassline) command matches, if any."""
+        command = command.lower()
+        if 'bassline' in command:
+            return None
+        for pattern, action in self.command_patterns.items():
+            if pattern in command:
+                return action
+        return None
+    
+    def _is_command(self, fragment: str) -> bool:
+        """Check whether a fragment of a compound command parses as a command on its own."""
+        try:
+            self._process_basic(fragment)
+            return True
+        except ValueError:
+            return False
+    
     def _process_basic(self, command: str) -> Tuple[str, Dict[str, Any]]:
         """Basic command processing without GPT."""
         command = command.lower()
@@ -133,23 +230,12 @@ class CommandProcessor:
             return 'create_bassline', params
         
         # Handle other commands
-        for pattern, action in self.command_patterns.items():
-            if pattern in command:
-                params = {}
-                
-                # Extract numeric values
-                words = command.split()
-                for word in words:
-                    try:
-                        value = float(word)
-                        # Assign value to first unassigned parameter
-                        for param in action['params']:
-                            if param not in params:
-                                params[param] = value
-                                break
-                    except ValueError:
-                        continue
-                
-                return action['function'], params
+        action = self._match_action(command)
+        if action:
+            # Assign numeric values to the parameters in order
+            values = [float(value) for value in NUMBERS.findall(command)]
+            if len(values) > len(action['params']):
+                raise ValueError(f"Too many values for {action['function']}: {command}")
+            return action['function'], dict(zip(action['params'], values))
         
-        raise ValueError(f"Could not understand command: {command}") 
\ No newline at end of file
+        raise ValueError(f"Could not understand command: {command}")
\ No newline at end of file
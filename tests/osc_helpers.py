@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Local UDP stand-ins for Ableton Live instances, shared by the tests."""
+import os
+import sys
+import socket
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pythonosc.osc_packet import OscPacket
+
+from src.ableton.controller import AbletonController
+
+
+def make_listeners(count=1):
+    """Open local UDP sockets standing in for AbletonOSC."""
+    listeners = []
+    for _ in range(count):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        listeners.append(sock)
+    return listeners
+
+
+def receive_all(sock):
+    """Return the OSC messages of every datagram waiting on the socket, per datagram."""
+    datagrams = []
+    sock.settimeout(0.2)
+    try:
+        while True:
+            data, _ = sock.recvfrom(65536)
+            packet = OscPacket(data)
+            datagrams.append([(m.message.address, tuple(m.message.params)) for m in packet.messages])
+    except socket.timeout:
+        pass
+    return datagrams
+
+
+def make_controller(sock, controller_class=AbletonController):
+    """Create a controller sending to the stand-in and drop its /live/test connection check."""
+    controller = controller_class(port=sock.getsockname()[1])
+    receive_all(sock)
+    return controller
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import os
+import sys
+import asyncio
+from contextlib import contextmanager
+
+# Add parent directory and src/ to Python path (main.py imports its siblings directly)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+
+from src.nlp.processor import CommandProcessor
+from ableton.controller import AbletonController
+from ableton.clip_creator import ClipCreator
+from ableton.command_registry import CommandRegistry
+from osc_helpers import make_listeners, receive_all, make_controller
+
+
+class CountingProcessor(CommandProcessor):
+    """Command processor that counts how often it parses a command."""
+
+    def __init__(self):
+        super().__init__()
+        self.client = None
+        self.calls = 0
+
+    async def process_commands(self, command):
+        self.calls += 1
+        return await super().process_commands(command)
+
+
+@contextmanager
+def make_registry(maxsize=128):
+    """Yield a registry whose controller talks to a local stand-in, not a running Live."""
+    sock, = make_listeners()
+    try:
+        controller = make_controller(sock, AbletonController)
+        yield CommandRegistry(controller, ClipCreator(controller), maxsize=maxsize)
+        # Compiling only records commands, nothing is sent
+        assert receive_all(sock) == []
+    finally:
+        sock.close()
+
+
+def test_params_are_validated_and_coerced():
+    """Test that parsed floats become track indices and values are clamped."""
+    with make_registry() as registry:
+        assert registry.compile('mute_track', {'track': 2.0}) == [('/live/track/set/mute', (2, 1))]
+        assert registry.compile('set_track_volume', {'track': '1', 'volume': 1.5}) == [
+            ('/live/track/set/volume', (1, 1.0))
+        ]
+        assert isinstance(registry.compile('solo_track', {'track': 3.0})[0][1][0], int)
+
+        # Bassline length is clamped like tempo and volume
+        plan = registry.compile('create_bassline', {'root': 'C', 'pattern': 'walking', 'length': 1000})
+        assert plan[2] == ('/live/clip_slot/create_clip', (0, 0, 64.0))
+        assert len(plan) == 3 + 64 * 4 + 1
+
+
+def test_invalid_params_are_rejected():
+    """Test that bad commands fail before anything is sent."""
+    with make_registry() as registry:
+        for function_name, params in [
+            ('send_command', {}),
+            ('mute_track', {}),
+            ('mute_track', {'track': 2.5}),
+            ('mute_track', {'track': -1}),
+            ('set_tempo', {'bpm': 'fast'}),
+            ('start_playback', {'bpm': 120}),
+            ('create_bassline', {'root': 'H'}),
+            ('set_tempo', {'bpm': float('nan')}),
+            ('set_tempo', {'bpm': 'inf'}),
+            ('set_track_volume', {'track': 0, 'volume': float('-inf')}),
+            ('mute_track', {'track': True}),
+            ('create_bassline', {'length': False}),
+        ]:
+            try:
+                registry.compile(function_name, params)
+            except ValueError:
+                continue
+            raise AssertionError(f"{function_name}({params}) was accepted")
+
+
+def test_identical_commands_reuse_plan():
+    """Test that a repeated command skips parsing and bassline generation."""
+    with make_registry() as registry:
+        processor = CountingProcessor()
+
+        first = asyncio.run(registry.get_plan("create a bassline in G minor and play", processor))
+        second = asyncio.run(registry.get_plan("Create a bassline in G minor  and play", processor))
+
+        assert processor.calls == 1
+        assert second == first
+        assert first[0] == ('/live/song/create_midi_track', (0,))
+        assert first[1] == ('/live/track/set/name', (0, 'G Minor Bass'))
+        assert first[-1] == ('/live/song/start_playing', ())
+        assert registry.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 128, 'hit_rate': 0.5}
+
+
+def test_plan_cache_is_bounded():
+    """Test that the least recently used plan is evicted."""
+    with make_registry(maxsize=2) as registry:
+        processor = CountingProcessor()
+
+        for command in ["tempo 120", "play", "tempo 120", "stop"]:
+            asyncio.run(registry.get_plan(command, processor))
+
+        assert registry.stats()['size'] == 2
+        asyncio.run(registry.get_plan("tempo 120", processor))
+        asyncio.run(registry.get_plan("play", processor))
+        assert processor.calls == 4
+        assert registry.stats()['hits'] == 2
+
+
+if __name__ == "__main__":
+    test_params_are_validated_and_coerced()
+    test_invalid_params_are_rejected()
+    test_identical_commands_reuse_plan()
+    test_plan_cache_is_bounded()
+    print("\nAll command registry tests passed!")
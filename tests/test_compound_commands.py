@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import asyncio
+from types import SimpleNamespace
+
+# Add parent directory and src/ to Python path (main.py imports its siblings directly)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+
+from src.nlp.processor import CommandProcessor
+from ableton.controller import AbletonController, MAX_DATAGRAM_SIZE
+from ableton.clip_creator import ClipCreator
+from main import process_musical_command
+from osc_helpers import make_listeners, receive_all, make_controller
+
+
+class StubCompletions:
+    """Stand-in for the OpenAI chat completions API that counts calls."""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def make_gpt_processor(content):
+    processor = CommandProcessor()
+    completions = StubCompletions(content)
+    processor.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return processor, completions
+
+
+def test_compound_command_parsing():
+    """Test splitting a compound command into an ordered action list."""
+    processor = CommandProcessor()
+    processor.client = None
+
+    actions = asyncio.run(processor.process_commands("tempo 124, mute track 2, solo track 3 and play"))
+
+    assert [function for function, _ in actions] == ['set_tempo', 'mute_track', 'solo_track', 'start_playback']
+    assert actions[0][1] == {'bpm': 124.0}
+    assert actions[1][1] == {'track': 2.0}
+    assert actions[2][1] == {'track': 3.0}
+
+
+def test_comma_then_is_one_separator():
+    """Test that ", then" and ", and" do not leave a stray comma on the previous clause."""
+    processor = CommandProcessor()
+    processor.client = None
+
+    for command in ["solo track 1, then mute track 2", "solo track 1, and then mute track 2",
+                    "solo track 1; and mute track 2"]:
+        actions = asyncio.run(processor.process_commands(command))
+        assert actions == [('solo_track', {'track': 1.0}), ('mute_track', {'track': 2.0})]
+
+
+def test_single_command_parsing():
+    """Test that a plain command still yields one action."""
+    processor = CommandProcessor()
+    processor.client = None
+
+    actions = asyncio.run(processor.process_commands("create a bassline in G minor"))
+
+    assert actions == [('create_bassline', {'root': 'G', 'scale_type': 'minor', 'pattern': 'walking', 'length': 4})]
+
+
+def test_compound_command_single_gpt_call():
+    """Test that the GPT path parses a compound command with one call."""
+    processor, completions = make_gpt_processor(json.dumps({"actions": [
+        {"function": "set_tempo", "parameters": {"bpm": 124}},
+        {"function": "mute_track", "parameters": {"track": 2}},
+        {"function": "start_playback", "parameters": {}},
+    ]}))
+
+    actions = asyncio.run(processor.process_commands("tempo 124, mute track 2 and play"))
+
+    assert completions.calls == 1
+    assert actions == [('set_tempo', {'bpm': 124}), ('mute_track', {'track': 2}), ('start_playback', {})]
+
+
+def test_unreadable_gpt_response_falls_back():
+    """Test that an unreadable GPT response falls back to basic processing."""
+    processor, completions = make_gpt_processor("not json")
+
+    actions = asyncio.run(processor.process_commands("tempo 124 and play"))
+
+    assert completions.calls == 1
+    assert actions == [('set_tempo', {'bpm': 124.0}), ('start_playback', {})]
+
+
+def test_continuations_stay_in_their_clause():
+    """Test that separators not followed by a command do not split the command."""
+    processor = CommandProcessor()
+    processor.client = None
+
+    actions = asyncio.run(processor.process_commands("trigger clip 1, 2"))
+    assert actions == [('trigger_clip', {'track': 1.0, 'clip': 2.0})]
+
+    actions = asyncio.run(processor.process_commands("create a bassline in C minor with octave and walking"))
+    assert actions == [('create_bassline', {'root': 'C', 'scale_type': 'minor', 'pattern': 'octave', 'length': 4})]
+
+
+def test_continuations_reach_ableton():
+    """Test continuations and value lists end to end."""
+    sock, = make_listeners()
+    try:
+        controller = make_controller(sock, AbletonController)
+        clip_creator = ClipCreator(controller)
+        processor = CommandProcessor()
+
+        asyncio.run(process_musical_command("trigger clip 1, 2", controller, clip_creator, processor))
+        asyncio.run(process_musical_command("mute track 2, 3 and 4", controller, clip_creator, processor))
+
+        assert receive_all(sock) == [
+            [('/live/clip/fire', (1, 2))],
+            [('/live/track/set/mute', (2, 1)), ('/live/track/set/mute', (3, 1)), ('/live/track/set/mute', (4, 1))],
+        ]
+    finally:
+        sock.close()
+
+
+def test_value_lists_repeat_the_command():
+    """Test that every value in a list reaches the command, and extra values are refused."""
+    processor = CommandProcessor()
+    processor.client = None
+
+    actions = asyncio.run(processor.process_commands("mute track 2, 3 and 4"))
+    assert actions == [('mute_track', {'track': 2.0}), ('mute_track', {'track': 3.0}),
+                       ('mute_track', {'track': 4.0})]
+
+    try:
+        asyncio.run(processor.process_commands("trigger clip 1, 2, 3"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Extra values were silently dropped")
+
+
+def test_compound_command_single_dispatch():
+    """Test that a compound command reaches Ableton as one bundle."""
+    sock, = make_listeners()
+    try:
+        controller = make_controller(sock, AbletonController)
+        processor = CommandProcessor()
+
+        asyncio.run(process_musical_command("tempo 124 and then play", controller,
+                                            ClipCreator(controller), processor))
+
+        assert receive_all(sock) == [[
+            ('/live/song/set/tempo', (124.0,)),
+            ('/live/song/start_playing', ()),
+        ]]
+    finally:
+        sock.close()
+
+
+def test_large_bundles_are_split():
+    """Test that a dispatch too large for one datagram is split in order."""
+    sock, = make_listeners()
+    try:
+        controller = make_controller(sock, AbletonController)
+        commands = [('/live/clip/add/notes', (0, 0, 36 + i % 12, i * 0.25, 0.25, 100, 0)) for i in range(1000)]
+
+        controller.send_bundle(commands)
+
+        datagrams = receive_all(sock)
+        assert len(datagrams) > 1
+        assert [command for datagram in datagrams for command in datagram] == commands
+    finally:
+        sock.close()
+
+
+def test_invalid_action_sends_nothing():
+    """Test that one invalid action aborts the whole compound command."""
+    sock, = make_listeners()
+    try:
+        controller = make_controller(sock, AbletonController)
+        try:
+            asyncio.run(process_musical_command("tempo 120 and mute track -1", controller,
+                                                ClipCreator(controller), CommandProcessor()))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Invalid track index was accepted")
+
+        assert receive_all(sock) == []
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    test_compound_command_parsing()
+    test_comma_then_is_one_separator()
+    test_single_command_parsing()
+    test_compound_command_single_gpt_call()
+    test_unreadable_gpt_response_falls_back()
+    test_continuations_stay_in_their_clause()
+    test_continuations_reach_ableton()
+    test_value_lists_repeat_the_command()
+    test_compound_command_single_dispatch()
+    test_large_bundles_are_split()
+    test_invalid_action_sends_nothing()
+    print("\nAll compound command tests passed!")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+import os
+import sys
+import asyncio
+import threading
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ableton.controller_pool import ControllerPool
+from src.ableton.clip_creator import ClipCreator
+from src.ableton.command_registry import CommandRegistry
+from src.nlp.processor import CommandProcessor
+from osc_helpers import make_listeners, receive_all
+from pythonosc.osc_packet import OscPacket
+
+
+def answer_probes(sock):
+    """Reply to /live/test from the stand-in's own socket, as AbletonOSC does."""
+    def run():
+        sock.settimeout(2.0)
+        try:
+            while True:
+                data, sender = sock.recvfrom(65536)
+                if any(m.message.address == '/live/test' for m in OscPacket(data).messages):
+                    sock.sendto(data, sender)
+        except OSError:
+            pass
+    threading.Thread(target=run, daemon=True).start()
+
+
+def make_pool(listeners):
+    pool = ControllerPool([sock.getsockname() for sock in listeners])
+    for sock in listeners:
+        assert receive_all(sock) == [[('/live/test', ())]]
+    return pool
+
+
+def test_tracks_are_sharded():
+    """Test that track commands reach only the instance owning the track."""
+    listeners = make_listeners(2)
+    try:
+        pool = make_pool(listeners)
+
+        pool.mute_track(0)
+        pool.solo_track(3)
+
+        assert receive_all(listeners[0]) == [[('/live/track/set/mute', (0, 1))]]
+        assert receive_all(listeners[1]) == [[('/live/track/set/solo', (1, 1))]]
+    finally:
+        for sock in listeners:
+            sock.close()
+
+
+def test_transport_and_tempo_are_broadcast():
+    """Test that a dispatch is split into one bundle per instance."""
+    listeners = make_listeners(3)
+    try:
+        pool = make_pool(listeners)
+
+        with pool.record() as commands:
+            pool.set_tempo(124.0)
+            pool.mute_track(2)
+            pool.start_playback()
+        pool.send_bundle(commands)
+
+        broadcast = [('/live/song/set/tempo', (124.0,)), ('/live/song/start_playing', ())]
+        assert receive_all(listeners[0]) == [broadcast]
+        assert receive_all(listeners[1]) == [broadcast]
+        assert receive_all(listeners[2]) == [[broadcast[0], ('/live/track/set/mute', (0, 1)), broadcast[1]]]
+    finally:
+        for sock in listeners:
+            sock.close()
+
+
+def test_large_shares_are_split():
+    """Test that an instance's share too large for one datagram is split in order."""
+    listeners = make_listeners(2)
+    try:
+        pool = make_pool(listeners)
+        commands = [('/live/clip/add/notes', (2, 0, 36, i * 0.25, 0.25, 100, 0)) for i in range(1000)]
+
+        pool.send_bundle(commands)
+
+        datagrams = receive_all(listeners[0])
+        assert len(datagrams) > 1
+        assert [command for datagram in datagrams for command in datagram] == [
+            (address, (1,) + args[1:]) for address, args in commands
+        ]
+        assert receive_all(listeners[1]) == []
+    finally:
+        for sock in listeners:
+            sock.close()
+
+
+def test_bassline_stays_on_its_instance():
+    """Test that a bassline's track is created only where its clip goes."""
+    listeners = make_listeners(2)
+    try:
+        pool = make_pool(listeners)
+        registry = CommandRegistry(pool, ClipCreator(pool))
+        processor = CommandProcessor()
+        processor.client = None
+
+        pool.send_bundle(asyncio.run(registry.get_plan("create a bassline in G minor", processor)))
+
+        bundle, = receive_all(listeners[0])
+        assert bundle[0] == ('/live/song/create_midi_track', (0,))
+        assert bundle[1] == ('/live/track/set/name', (0, 'G Minor Bass'))
+        assert bundle[-1] == ('/live/clip/fire', (0, 0))
+        assert receive_all(listeners[1]) == []
+
+        # Appending at the end of "the" track list has no owning instance
+        try:
+            pool.create_midi_track()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Track creation without an index was sent")
+    finally:
+        for sock in listeners:
+            sock.close()
+
+
+def test_stats():
+    """Test per-instance counters and that duplicate endpoints share a socket."""
+    listeners = make_listeners(2)
+    try:
+        endpoints = [sock.getsockname() for sock in listeners]
+        pool = ControllerPool(endpoints + endpoints[:1])
+        assert len(pool.endpoints) == 2
+        assert pool.client is pool.endpoints[0].client
+
+        pool.start_playback()
+        pool.set_track_volume(1, 0.5)
+
+        first, second = pool.stats()
+        assert (first['sent'], second['sent']) == (2, 3)
+        assert first['rate'] > 0 and first['errors'] == 0
+        assert first['healthy'] is None  # Not checked yet
+
+        # A local send failure is counted without stopping the others
+        pool.endpoints[0].client._sock.close()
+        pool.stop_playback()
+        first, second = pool.stats()
+        assert first['errors'] == 1 and first['last_error']
+        assert second['sent'] == 4
+    finally:
+        for sock in listeners:
+            sock.close()
+
+
+def test_health_check():
+    """Test that only instances answering /live/test are healthy."""
+    listeners = make_listeners(3)
+    try:
+        answer_probes(listeners[0])
+        endpoints = [sock.getsockname() for sock in listeners]
+        # The third instance is down: nothing listens on its port
+        listeners[2].close()
+        pool = ControllerPool(endpoints, return_port=0)
+
+        alive, silent, down = pool.check_health(timeout=0.5)
+
+        assert alive['healthy'] and alive['last_seen'] is not None
+        assert silent['healthy'] is False and down['healthy'] is False
+
+        try:
+            ControllerPool(endpoints[:1]).check_health()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("Health check without a return port did not fail")
+    finally:
+        for sock in listeners:
+            sock.close()
+
+
+def test_lost_sharded_commands_raise():
+    """Test that a failed instance only raises when it owned sharded commands."""
+    listeners = make_listeners(2)
+    try:
+        pool = make_pool(listeners)
+        pool.endpoints[1].client._sock.close()
+
+        # Broadcast only: best effort, the reachable instance still gets it
+        pool.set_tempo(120.0)
+        assert receive_all(listeners[0]) == [[('/live/song/set/tempo', (120.0,))]]
+
+        with pool.record() as commands:
+            pool.set_tempo(124.0)
+            pool.mute_track(1)
+        try:
+            pool.send_bundle(commands)
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("Losing a sharded command did not raise")
+        assert receive_all(listeners[0]) == [[('/live/song/set/tempo', (124.0,))]]
+    finally:
+        for sock in listeners:
+            sock.close()
+
+
+def test_from_env():
+    """Test configuring the pool from the environment."""
+    listeners = make_listeners(2)
+    saved = {key: os.environ.get(key) for key in ('ABLETON_OSC_INSTANCES', 'ABLETON_OSC_HOST', 'ABLETON_OSC_PORT',
+                                                  'ABLETON_OSC_RETURN_PORT')}
+    try:
+        os.environ['ABLETON_OSC_INSTANCES'] = ','.join(f"127.0.0.1:{sock.getsockname()[1]}" for sock in listeners)
+        os.environ['ABLETON_OSC_RETURN_PORT'] = '0'
+        pool = ControllerPool.from_env()
+        assert [e.port for e in pool.endpoints] == [s.getsockname()[1] for s in listeners]
+        assert pool.return_socket is not None
+        pool.return_socket.close()
+
+        del os.environ['ABLETON_OSC_INSTANCES']
+        os.environ['ABLETON_OSC_HOST'] = '127.0.0.1'
+        os.environ['ABLETON_OSC_PORT'] = str(listeners[1].getsockname()[1])
+        assert [e.port for e in ControllerPool.from_env().endpoints] == [listeners[1].getsockname()[1]]
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        for sock in listeners:
+            sock.close()
+
+
+if __name__ == "__main__":
+    test_tracks_are_sharded()
+    test_transport_and_tempo_are_broadcast()
+    test_large_shares_are_split()
+    test_bassline_stays_on_its_instance()
+    test_stats()
+    test_health_check()
+    test_lost_sharded_commands_raise()
+    test_from_env()
+    print("\nAll controller pool tests passed!")